@@ -0,0 +1,30 @@
+"""
+Швидка (де)серіалізація JSON: orjson, якщо встановлено, інакше стандартний json.
+Обидві функції працюють з UTF-8 bytes, тож результат можна одразу писати
+у файл, відкритий у двійковому режимі, або передавати в subprocess.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj, indent=False) -> bytes:
+    """Серіалізувати obj у UTF-8 bytes (з відступом у 2 пробіли, якщо indent)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False,
+                      indent=2 if indent else None).encode('utf-8')
+
+
+def loads(data):
+    """Розібрати JSON із bytes або str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
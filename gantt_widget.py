@@ -2,11 +2,15 @@
 Віджет діаграми Ганта для відображення результатів планування.
 """
 
+from functools import lru_cache
+
 from PyQt5.QtWidgets import (
     QWidget, QScrollArea, QVBoxLayout, QLabel, QMainWindow, QShortcut,
 )
-from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QFontMetrics, QKeySequence
-from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import (
+    QPainter, QColor, QFont, QPen, QFontMetrics, QKeySequence, QPixmap,
+)
+from PyQt5.QtCore import Qt, QLine, QRect, QRectF
 
 
 # Палітра кольорів для операцій
@@ -34,12 +38,42 @@ class GanttCanvas(QWidget):
     LEFT_MARGIN = 160
     RIGHT_MARGIN = 30
     TOP_MARGIN = 10
+    ROUNDED_BAR_MIN_WIDTH = 8
+
+    # Шрифти та пера створюються один раз і спільні для всіх перемальовувань
+    _FONT_EMPTY = QFont('Arial', 12)
+    _FONT_HEADER = QFont('Arial', 8)
+    _FONT_ROW = QFont('Arial', 10)
+    _FONT_BAR = QFont('Arial', 8, QFont.Bold)
+    _FM_BAR = None  # QFontMetrics(_FONT_BAR), потребує QApplication
+    _FM_HEADER = None
+    _DEFAULT_BAR_COLOR = QColor(100, 100, 100)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._schedule = None
         self._makespan = 0
         self._worker_colors = {}  # {worker_name: QColor}
+        self._cache_pixmap = None  # відмальована смуга діаграми, скидається при змінах
+        self._cache_rect = QRect()  # ділянка полотна, яку покриває _cache_pixmap
+        self._by_worker = {}  # {worker_name: [assignment, ...]}
+        self._worker_order = []
+        self._op_color_map = {}  # {operation_name: QColor}
+        self._bar_geometry = {}  # {worker_name: [(x_start, bar_w), ...]}
+        self._bar_geometry_scale = None
+        if GanttCanvas._FM_BAR is None:
+            GanttCanvas._FM_BAR = QFontMetrics(self._FONT_BAR)
+            GanttCanvas._FM_HEADER = QFontMetrics(self._FONT_HEADER)
+        self._pen_empty = QPen(QColor(180, 180, 180))
+        self._pen_axis = QPen(QColor(100, 100, 100))
+        self._pen_grid = QPen(QColor(220, 220, 220))
+        self._pen_name = QPen(QColor(50, 50, 50))
+        self._pen_label = QPen(QColor(255, 255, 255))
+        self._bar_pens = {}  # {rgba: QPen}
+        # Назви операцій повторюються на багатьох смугах — кешуємо обрізання
+        self._elide = lru_cache(maxsize=4096)(self._elide_label)
+        # Фон заливаємо самі лише в межах оновленої ділянки
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
         self.setMinimumHeight(200)
 
     def set_worker_colors(self, color_map: dict):
@@ -47,128 +81,238 @@ class GanttCanvas(QWidget):
         self._worker_colors = {
             name: QColor(color) for name, color in color_map.items()
         }
+        self._cache_pixmap = None
+        self.update()
+
+    def _elide_label(self, text, avail_w):
+        """Обрізати підпис смуги до доступної ширини."""
+        if self._FM_BAR.horizontalAdvance(text) > avail_w:
+            return self._FM_BAR.elidedText(text, Qt.ElideRight, avail_w)
+        return text
 
     def set_schedule(self, schedule: dict):
         self._schedule = schedule
         self._makespan = schedule.get('makespan', 0)
+        self._elide.cache_clear()
+        self._cache_pixmap = None
+
+        # Інваріанти малювання рахуємо один раз: порядок працівників,
+        # їхні операції та кольори операцій
+        assignments = schedule.get('assignments', [])
+        self._by_worker = {}
+        for a in assignments:
+            # scheduler_worker завжди заповнює 'workers'
+            for w in dict.fromkeys(a['workers']):
+                self._by_worker.setdefault(w, []).append(a)
+        self._worker_order = list(self._by_worker)
+        self._bar_geometry_scale = None
+
+        op_names = dict.fromkeys(a['operation_name'] for a in assignments)
+        self._op_color_map = {
+            name: _COLORS[i % len(_COLORS)] for i, name in enumerate(op_names)
+        }
 
         # Обчислити потрібну висоту
-        workers = set()
-        for a in schedule.get('assignments', []):
-            for w in a.get('workers', []):
-                workers.add(w)
-        row_count = max(len(workers), 1)
+        row_count = max(len(self._worker_order), 1)
         height = self.TOP_MARGIN + self.HEADER_HEIGHT + row_count * self.ROW_HEIGHT + 40
         self.setMinimumHeight(int(height))
         self.update()
 
+    def resizeEvent(self, event):
+        self._cache_pixmap = None
+        super().resizeEvent(event)
+
     def paintEvent(self, event):
+        exposed = event.rect()
+        if self._cache_pixmap is None or not self._cache_rect.contains(exposed):
+            band = self._cache_band()
+            if not band.contains(exposed):
+                # Ділянка більша за смугу кешу (напр. grab() усього полотна):
+                # малюємо напряму, без величезного pixmap
+                painter = QPainter(self)
+                self._render_to(painter, exposed)
+                painter.end()
+                return
+            self._render_cache(band)
+
+        dpr = self._cache_pixmap.devicePixelRatioF()
+        source = QRectF(exposed.translated(-self._cache_rect.topLeft()))
+        source = QRectF(source.topLeft() * dpr, source.size() * dpr)
+        painter = QPainter(self)
+        painter.drawPixmap(QRectF(exposed), self._cache_pixmap, source)
+        painter.end()
+
+    def _cache_band(self):
+        """Смуга для кешу: видима частина полотна плюс по екрану зверху й знизу."""
+        visible = self.visibleRegion().boundingRect()
+        if visible.isEmpty():
+            visible = self.rect()
+        margin = visible.height()
+        band = QRect(0, visible.top() - margin, self.width(), visible.height() + 2 * margin)
+        return band.intersected(self.rect())
+
+    def _render_cache(self, band):
+        """Відмалювати в pixmap лише смугу band — розмір не залежить від кількості рядків."""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(band.size() * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        cache_painter = QPainter(pixmap)
+        cache_painter.translate(-band.topLeft())
+        self._render_to(cache_painter, band)
+        cache_painter.end()
+        self._cache_pixmap = pixmap
+        self._cache_rect = band
+
+    def _bar_pen(self, key, color):
+        """Перо обведення смуги, кешоване за кольором."""
+        pen = self._bar_pens.get(key)
+        if pen is None:
+            pen = self._bar_pens[key] = QPen(color.darker(130), 1)
+        return pen
+
+    def _update_bar_geometry(self, px_per_unit):
+        """Перерахувати x-координати смуг лише при зміні масштабу."""
+        if self._bar_geometry_scale == px_per_unit:
+            return
+        left = self.LEFT_MARGIN
+        geometry = {}
+        for worker_name, bars in self._by_worker.items():
+            row = []
+            for a in bars:
+                x_start = left + a['start'] * px_per_unit
+                x_end = left + a['end'] * px_per_unit
+                row.append((x_start, max(x_end - x_start, 2)))
+            geometry[worker_name] = row
+        self._bar_geometry = geometry
+        self._bar_geometry_scale = px_per_unit
+
+    def _render_to(self, painter, dirty):
+        """Намалювати діаграму в межах ділянки dirty."""
+        painter.fillRect(dirty, self.palette().window())
+
         if not self._schedule or not self._schedule.get('assignments'):
-            painter = QPainter(self)
-            painter.setPen(QColor(180, 180, 180))
-            painter.setFont(QFont('Arial', 12))
+            painter.setPen(self._pen_empty)
+            painter.setFont(self._FONT_EMPTY)
             painter.drawText(self.rect(), Qt.AlignCenter, 'Немає даних для відображення')
-            painter.end()
             return
 
-        painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
 
-        assignments = self._schedule['assignments']
         makespan = max(self._makespan, 1)
 
-        # Збираємо унікальних працівників у порядку появи
-        worker_order = []
-        seen = set()
-        for a in assignments:
-            for w in a.get('workers', []):
-                if w not in seen:
-                    worker_order.append(w)
-                    seen.add(w)
-
+        worker_order = self._worker_order
         if not worker_order:
-            painter.end()
             return
 
         # Кольори операцій (fallback якщо немає кольорів працівників)
-        op_names = list(dict.fromkeys(a['operation_name'] for a in assignments))
-        op_color_map = {}
-        for i, name in enumerate(op_names):
-            op_color_map[name] = _COLORS[i % len(_COLORS)]
+        op_color_map = self._op_color_map
 
         use_worker_colors = bool(self._worker_colors)
 
         width = self.width()
         chart_width = width - self.LEFT_MARGIN - self.RIGHT_MARGIN
         px_per_unit = chart_width / makespan if makespan > 0 else 1
+        self._update_bar_geometry(px_per_unit)
 
         y0 = self.TOP_MARGIN + self.HEADER_HEIGHT
 
         # --- Часова шкала (робоча зміна 8:00–17:00) ---
-        painter.setPen(QPen(QColor(100, 100, 100)))
-        painter.setFont(QFont('Arial', 8))
+        painter.setPen(self._pen_axis)
+        painter.setFont(self._FONT_HEADER)
 
         step = max(1, makespan // 20)
         # Вирівнюємо крок до 60 хвилин для читабельності
         if step > 30:
             step = max(60, (step // 60) * 60)
+        # Поділки, що потрапляють в один піксель, малюємо один раз, а підпис —
+        # лише якщо він не налізе на попередній
+        y_bottom = y0 + len(worker_order) * self.ROW_HEIGHT
+        tick_lines = []
+        tick_labels = []
+        last_x = None
+        label_right = None
         for t in range(0, makespan + 1, step):
-            x = self.LEFT_MARGIN + t * px_per_unit
-            painter.drawLine(int(x), y0 - 5, int(x), y0 + len(worker_order) * self.ROW_HEIGHT)
+            x = int(self.LEFT_MARGIN + t * px_per_unit)
+            if x == last_x:
+                continue
+            last_x = x
+            tick_lines.append(QLine(x, y0 - 5, x, y_bottom))
+
             day = t // 480
             rem = t % 480
             hour = 8 + rem // 60
             minute = rem % 60
             label = f'Д{day + 1} {hour}:{minute:02d}'
-            painter.drawText(int(x) - 20, y0 - 8, label)
+            if label_right is None or x - 20 >= label_right:
+                tick_labels.append((x - 20, label))
+                label_right = x - 20 + self._FM_HEADER.horizontalAdvance(label) + 4
+
+        painter.drawLines(tick_lines)
+        for x, label in tick_labels:
+            painter.drawText(x, y0 - 8, label)
 
         # --- Рядки працівників ---
-        painter.setFont(QFont('Arial', 10))
+        bars_by_color = {}  # {rgba: (QColor, [QRectF, ...])}
+        labels = []  # [(QRectF, operation_name), ...]
+        grid_lines = []
+        names = []  # [(y, worker_name), ...]
         for row, worker_name in enumerate(worker_order):
             y = y0 + row * self.ROW_HEIGHT
 
-            # Горизонтальна лінія-розділювач
-            painter.setPen(QPen(QColor(220, 220, 220)))
-            painter.drawLine(self.LEFT_MARGIN, int(y + self.ROW_HEIGHT),
-                             int(width - self.RIGHT_MARGIN), int(y + self.ROW_HEIGHT))
+            # Пропускаємо рядки поза ділянкою, яку Qt просить перемалювати
+            if not dirty.intersects(QRect(0, int(y), width, self.ROW_HEIGHT + 1)):
+                continue
 
-            # Ім'я працівника
-            painter.setPen(QColor(50, 50, 50))
-            painter.drawText(5, int(y + 4), self.LEFT_MARGIN - 10, self.ROW_HEIGHT,
-                             Qt.AlignVCenter | Qt.AlignRight, worker_name)
+            # Горизонтальна лінія-розділювач та ім'я працівника
+            grid_lines.append(QLine(self.LEFT_MARGIN, int(y + self.ROW_HEIGHT),
+                                    int(width - self.RIGHT_MARGIN), int(y + self.ROW_HEIGHT)))
+            names.append((y, worker_name))
 
-            # Блоки операцій
-            for a in assignments:
-                if worker_name not in a.get('workers', []):
+            # Блоки операцій — збираємо, малюємо нижче групами за кольором
+            bars = zip(self._by_worker[worker_name], self._bar_geometry[worker_name])
+            for a, (x_start, bar_w) in bars:
+                if not dirty.intersects(QRect(int(x_start), int(y),
+                                              int(bar_w) + 2, self.ROW_HEIGHT)):
                     continue
 
-                x_start = self.LEFT_MARGIN + a['start'] * px_per_unit
-                x_end = self.LEFT_MARGIN + a['end'] * px_per_unit
-                bar_w = max(x_end - x_start, 2)
-
                 if use_worker_colors and worker_name in self._worker_colors:
                     color = self._worker_colors[worker_name]
                 else:
-                    color = op_color_map.get(a['operation_name'], QColor(100, 100, 100))
-                painter.setBrush(color)
-                painter.setPen(QPen(color.darker(130), 1))
+                    color = op_color_map.get(a['operation_name'], self._DEFAULT_BAR_COLOR)
 
                 rect = QRectF(x_start, y + 4, bar_w, self.ROW_HEIGHT - 8)
-                painter.drawRoundedRect(rect, 3, 3)
-
-                # Текст операції
-                painter.setPen(QColor(255, 255, 255))
-                painter.setFont(QFont('Arial', 8, QFont.Bold))
-                fm = QFontMetrics(painter.font())
-                label = a['operation_name']
-                avail_w = max(int(bar_w - 6), 0)
-                if fm.horizontalAdvance(label) > avail_w:
-                    label = fm.elidedText(label, Qt.ElideRight, avail_w)
-                painter.drawText(rect.adjusted(3, 0, -3, 0),
-                                 Qt.AlignVCenter | Qt.AlignLeft, label)
-                painter.setFont(QFont('Arial', 10))
+                bars_by_color.setdefault(color.rgba(), (color, []))[1].append(rect)
+                labels.append((rect, a['operation_name']))
+
+        # --- Розділювачі та імена: один стан пера на прохід ---
+        if grid_lines:
+            painter.setPen(self._pen_grid)
+            painter.drawLines(grid_lines)
+        painter.setPen(self._pen_name)
+        painter.setFont(self._FONT_ROW)
+        for y, worker_name in names:
+            painter.drawText(5, int(y + 4), self.LEFT_MARGIN - 10, self.ROW_HEIGHT,
+                             Qt.AlignVCenter | Qt.AlignRight, worker_name)
 
-        painter.end()
+        # --- Смуги: одне перо й пензель на колір, вузькі — без заокруглень ---
+        for key, (color, rects) in bars_by_color.items():
+            painter.setBrush(color)
+            painter.setPen(self._bar_pen(key, color))
+            thin = [r for r in rects if r.width() < self.ROUNDED_BAR_MIN_WIDTH]
+            if thin:
+                painter.drawRects(thin)
+            for rect in rects:
+                if rect.width() >= self.ROUNDED_BAR_MIN_WIDTH:
+                    painter.drawRoundedRect(rect, 3, 3)
+
+        # --- Підписи операцій ---
+        painter.setPen(self._pen_label)
+        painter.setFont(self._FONT_BAR)
+        for rect, text in labels:
+            avail_w = max(int(rect.width() - 6), 0)
+            label = self._elide(text, avail_w)
+            painter.drawText(rect.adjusted(3, 0, -3, 0),
+                             Qt.AlignVCenter | Qt.AlignLeft, label)
 
 
 class GanttWidget(QWidget):
@@ -7,7 +7,6 @@ Google OR-Tools для оптимального планування розкл
 """
 
 import sys
-import json
 import traceback
 
 from PyQt5.QtWidgets import (
@@ -22,6 +21,7 @@ from nodes import OperationNode
 from workers_window import WorkersWindow
 from scheduler import build_schedule
 from gantt_widget import GanttWidget, GanttWindow
+import fast_json
 
 
 class MainWindow(QMainWindow):
@@ -337,8 +337,8 @@ class MainWindow(QMainWindow):
             'workers': self._workers_window.get_workers_data(),
         }
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(path, 'wb') as f:
+                f.write(fast_json.dumps(data, indent=True))
             self._log_msg(f'Граф збережено: {path}')
         except Exception as e:
             QMessageBox.critical(self, 'Помилка збереження', str(e))
@@ -349,8 +349,8 @@ class MainWindow(QMainWindow):
         if not path:
             return
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(path, 'rb') as f:
+                data = fast_json.loads(f.read())
 
             if 'graph' in data:
                 self._graph.deserialize_session(data['graph'])
@@ -374,8 +374,8 @@ class MainWindow(QMainWindow):
             path += '.json'
 
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(self._last_schedule, f, ensure_ascii=False, indent=2)
+            with open(path, 'wb') as f:
+                f.write(fast_json.dumps(self._last_schedule, indent=True))
             self._log_msg(f'Розклад експортовано: {path}')
         except Exception as e:
             QMessageBox.critical(self, 'Помилка', str(e))
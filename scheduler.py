@@ -1,28 +1,199 @@
 """
 Модуль планування розкладу — запускає OR-Tools в окремому процесі,
 щоб C++ crash не вбивав GUI.
+
+Основний шлях — довгоживучий процес solver-а (SolverPool), з яким GUI
+обмінюється задачами через multiprocessing.Pipe: так запуск інтерпретатора
+та імпорт OR-Tools відбуваються один раз, а не на кожну побудову.
+Якщо цей процес падає, задача повторюється через одноразовий subprocess.
 """
 
 import sys
 import os
-import json
+import hashlib
 import subprocess
+import multiprocessing
+from collections import OrderedDict
+
+import fast_json
+
+
+# Скільки чекати на відповідь solver-а, с
+SOLVER_TIMEOUT = 60
+
+# Скільки останніх розкладів тримати в кеші (ключ — хеш нормалізованих вхідних даних)
+SCHEDULE_CACHE_SIZE = 32
+
+_schedule_cache = OrderedDict()
+
+# Останній розв'язок для підказки solver-у: (ключ операцій і залежностей,
+# [[operation_id, start, [worker_name, ...]], ...])
+_last_solution = None
+
+
+def _serve(conn):
+    """Точка входу постійного процесу solver-а."""
+    # OR-Tools імпортується лише тут, у дочірньому процесі
+    import scheduler_worker
+    scheduler_worker.serve_loop(conn)
+
+
+class SolverPool:
+    """
+    Постійний процес solver-а, що приймає задачі через Pipe.
+
+    Процес запускається при першому виклику та перезапускається,
+    якщо попередній завершився (crash, тайм-аут).
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self._ctx = multiprocessing.get_context('spawn')
+        self._proc = None
+        self._conn = None
+
+    def _ensure_started(self):
+        if self._proc is not None and self._proc.is_alive():
+            return
+        self.shutdown()
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_serve, args=(child_conn,), daemon=True)
+        proc.start()
+        child_conn.close()
+        self._proc = proc
+        self._conn = parent_conn
+
+    def solve(self, operations, dependencies, workers, timeout, hints=None):
+        """
+        Надіслати задачу процесу solver-а та дочекатися відповіді.
+        hints — попередній розв'язок для warm start (див. _solution_hints).
+
+        Повертає словник відповіді ({'ok': ..., 'result'/'error': ...})
+        або None, якщо solver не вклався в timeout.
+        Кидає EOFError / OSError, якщо процес solver-а завершився.
+        """
+        self._ensure_started()
+        self._conn.send((operations, dependencies, workers, hints))
+        if not self._conn.poll(timeout):
+            self.shutdown()
+            return None
+        return self._conn.recv()
+
+    def shutdown(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._proc is not None:
+            if self._proc.is_alive():
+                self._proc.terminate()
+            self._proc.join(1)
+            self._proc = None
+
+
+def _normalized_problem(operations, dependencies):
+    return [
+        sorted([op['id'], op['name'], int(op['duration']), int(op['workers_needed'])]
+               for op in operations),
+        sorted({tuple(d) for d in dependencies}),
+    ]
+
+
+def _hash(normalized):
+    return hashlib.blake2b(fast_json.dumps(normalized), digest_size=16).digest()
+
+
+def _cache_key(operations, dependencies, workers):
+    """
+    Хеш вхідних даних solver-а, нечутливий до порядку та до полів, які
+    на розклад не впливають (наприклад, кольору працівника).
+    """
+    normalized = _normalized_problem(operations, dependencies)
+    normalized.append(
+        sorted([w.get('name', ''), sorted(set(w.get('operations', ())))]
+               for w in workers))
+    return _hash(normalized)
+
+
+def _problem_key(operations, dependencies):
+    """Хеш лише операцій та залежностей — без працівників."""
+    return _hash(_normalized_problem(operations, dependencies))
+
+
+def _solution_hints(result):
+    """Стиснути розклад до підказки: [[operation_id, start, [worker, ...]], ...]."""
+    return [[a['operation_id'], a['start'], a['workers']]
+            for a in result['assignments']]
 
 
 def build_schedule(operations, dependencies, workers):
     """
-    Побудувати розклад, запустивши solver у окремому subprocess.
+    Побудувати розклад у окремому процесі solver-а.
+
+    Повторний виклик з тими самими даними повертає збережений результат
+    без запуску solver-а; скинути кеш — build_schedule.cache_clear().
 
     Returns dict or None.
     """
     if not operations:
         return {'makespan': 0, 'assignments': []}
 
-    input_data = json.dumps({
+    global _last_solution
+
+    key = _cache_key(operations, dependencies, workers)
+    if key in _schedule_cache:
+        _schedule_cache.move_to_end(key)
+        return _schedule_cache[key]
+
+    # Якщо змінились лише працівники, попередній розклад тих самих операцій
+    # — гарна стартова точка для solver-а
+    problem_key = _problem_key(operations, dependencies)
+    hints = None
+    if _last_solution is not None and _last_solution[0] == problem_key:
+        hints = _last_solution[1]
+
+    result = _solve(operations, dependencies, workers, hints)
+    if result is not None:
+        _schedule_cache[key] = result
+        if len(_schedule_cache) > SCHEDULE_CACHE_SIZE:
+            _schedule_cache.popitem(last=False)
+        _last_solution = (problem_key, _solution_hints(result))
+    return result
+
+
+build_schedule.cache_clear = _schedule_cache.clear
+
+
+def _solve(operations, dependencies, workers, hints=None):
+    pool = SolverPool.instance()
+    try:
+        response = pool.solve(operations, dependencies, workers, SOLVER_TIMEOUT,
+                              hints)
+    except (EOFError, OSError):
+        # Постійний процес впав — повторюємо в одноразовому subprocess,
+        # який поверне stderr із причиною
+        pool.shutdown()
+        return _build_schedule_subprocess(operations, dependencies, workers, hints)
+
+    if response is None:
+        return None
+    return _unwrap(response)
+
+
+def _build_schedule_subprocess(operations, dependencies, workers, hints=None):
+    """Запустити solver в одноразовому subprocess (JSON через stdin/stdout)."""
+    input_data = fast_json.dumps({
         'operations': operations,
         'dependencies': dependencies,
         'workers': workers,
-    }, ensure_ascii=False)
+        'hints': hints,
+    })
 
     worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)),
                                  'scheduler_worker.py')
@@ -32,23 +203,24 @@ def build_schedule(operations, dependencies, workers):
             [sys.executable, worker_script],
             input=input_data,
             capture_output=True,
-            text=True,
-            timeout=60,
+            timeout=SOLVER_TIMEOUT,
         )
     except subprocess.TimeoutExpired:
         return None
 
+    stderr = proc.stderr.decode('utf-8', errors='replace').strip()
     if proc.returncode != 0:
-        stderr = proc.stderr.strip()
         raise RuntimeError(
             'Solver process crashed (exit code %d).\n%s' % (proc.returncode, stderr)
         )
 
     if not proc.stdout.strip():
-        raise RuntimeError('Solver process returned empty output.\nstderr: %s' % proc.stderr)
+        raise RuntimeError('Solver process returned empty output.\nstderr: %s' % stderr)
 
-    response = json.loads(proc.stdout)
+    return _unwrap(fast_json.loads(proc.stdout))
+
+
+def _unwrap(response):
     if not response.get('ok'):
         raise RuntimeError('Solver error: %s' % response.get('error', 'unknown'))
-
     return response.get('result')
@@ -1,129 +1,402 @@
 """
 Окремий процес для запуску OR-Tools solver.
-Читає JSON зі stdin, виводить результат у stdout.
+Або приймає задачі через Pipe (serve_loop, постійний процес), або як скрипт
+читає JSON (UTF-8 bytes) зі stdin та виводить результат у stdout.
 Якщо solver крешне — впаде тільки цей процес, а не GUI.
 """
 
+import os
 import sys
-import json
+from operator import itemgetter
 
 from ortools.sat.python import cp_model
 
+import fast_json
 
-def build_schedule(operations, dependencies, workers):
+
+# Ліміт часу solver-а на одну побудову розкладу, с
+SOLVER_TIME_LIMIT = 30.0
+
+
+def _dependency_graph(operations, dependencies):
+    """
+    Граф залежностей: попередники, наступники та топологічний порядок
+    (алгоритм Кана). Будується один раз на виклик build_schedule().
+
+    Повертає (preds, succs, order); order дорівнює None, якщо граф містить цикл.
+    """
+    preds = {op['id']: [] for op in operations}
+    succs = {oid: [] for oid in preds}
+    for pred_id, succ_id in dependencies:
+        if pred_id in preds and succ_id in preds:
+            preds[succ_id].append(pred_id)
+            succs[pred_id].append(succ_id)
+
+    indegree = {oid: len(p) for oid, p in preds.items()}
+    queue = [oid for oid, deg in indegree.items() if deg == 0]
+    order = []
+    while queue:
+        oid = queue.pop()
+        order.append(oid)
+        for succ_id in succs[oid]:
+            indegree[succ_id] -= 1
+            if indegree[succ_id] == 0:
+                queue.append(succ_id)
+
+    if len(order) < len(preds):
+        return preds, succs, None
+    return preds, succs, order
+
+
+def time_windows(operations, graph):
+    """
+    Часові вікна операцій за графом залежностей.
+
+    head[v] — найраніший можливий старт v (найдовший шлях попередників),
+    tail[v] — мінімальний час після кінця v (найдовший шлях наступників).
+    graph — результат _dependency_graph(). Повертає (head, tail) або None,
+    якщо граф містить цикл.
+    """
+    preds, succs, order = graph
+    if order is None:
+        return None
+
+    dur = {op['id']: int(op['duration']) for op in operations}
+    head = {}
+    for oid in order:
+        head[oid] = max((head[p] + dur[p] for p in preds[oid]), default=0)
+    tail = {}
+    for oid in reversed(order):
+        tail[oid] = max((dur[s] + tail[s] for s in succs[oid]), default=0)
+    return head, tail
+
+
+def greedy_schedule(operations, graph, capable_by_op, worker_count):
+    """
+    Жадібний списковий розклад: операції в топологічному порядку, кожна —
+    на кваліфікованих працівників, які звільняються найраніше.
+
+    Повертає (starts, assigned, makespan) або None, якщо граф містить цикл.
+    """
+    preds, _, order = graph
+    if order is None:
+        return None
+
+    op_by_id = {op['id']: op for op in operations}
+    free_at = [0] * worker_count
+    starts = {}
+    ends = {}
+    assigned = {}
+    for oid in order:
+        op = op_by_id[oid]
+        ready = max((ends[p] for p in preds[oid]), default=0)
+        capable = capable_by_op.get(op['name'], [])
+        chosen = sorted(capable, key=lambda w_idx: max(free_at[w_idx], ready))
+        chosen = chosen[:int(op['workers_needed'])]
+
+        start = max([ready] + [free_at[w_idx] for w_idx in chosen])
+        end = start + int(op['duration'])
+        for w_idx in chosen:
+            free_at[w_idx] = end
+        starts[oid] = start
+        ends[oid] = end
+        assigned[oid] = set(chosen)
+
+    return starts, assigned, max(ends.values(), default=0)
+
+
+def _critical_path(operations, windows):
+    """Довжина критичного шляху — нижня межа makespan (0, якщо вікон немає)."""
+    if windows is None:
+        return 0
+    head, _ = windows
+    return max(head[op['id']] + int(op['duration']) for op in operations)
+
+
+def _hint_from_solution(operations, workers, hints):
+    """
+    Перетворити попередній розв'язок ([[operation_id, start, [worker, ...]], ...])
+    на підказку у форматі greedy_schedule(). Працівники, яких більше немає,
+    відкидаються. Повертає None, якщо розв'язок не покриває всіх операцій.
+    """
+    idx_by_name = {w['name']: w_idx for w_idx, w in enumerate(workers)}
+    previous = {oid: (start, names) for oid, start, names in hints}
+    starts = {}
+    assigned = {}
+    makespan = 0
+    for op in operations:
+        oid = op['id']
+        if oid not in previous:
+            return None
+        start, names = previous[oid]
+        starts[oid] = start
+        assigned[oid] = {idx_by_name[n] for n in names if n in idx_by_name}
+        makespan = max(makespan, start + int(op['duration']))
+    return starts, assigned, makespan
+
+
+def _tight_horizon(operations, windows, workers):
+    """Горизонт за нижньою оцінкою makespan (критичний шлях / навантаження) ×2."""
+    if windows is None:
+        return None
+    cp_len = _critical_path(operations, windows)
+    total_work = sum(int(op['duration']) * int(op['workers_needed']) for op in operations)
+    load = -(-total_work // max(1, len(workers)))
+    return max(cp_len, load) * 2
+
+
+def build_schedule(operations, dependencies, workers, hints=None):
+    """
+    hints — попередній розв'язок тих самих операцій (див. scheduler.py);
+    якщо він кращий за жадібний, пошук стартує з нього.
+    """
     if not operations:
         return {'makespan': 0, 'assignments': []}
 
-    model = cp_model.CpModel()
+    # Інвертований індекс: назва операції -> працівники, що її виконують
+    capable_by_op = {}
+    for w_idx, w in enumerate(workers):
+        for name in dict.fromkeys(w.get('operations', ())):
+            capable_by_op.setdefault(name, []).append(w_idx)
+
+    for op in operations:
+        if len(capable_by_op.get(op['name'], [])) < int(op['workers_needed']):
+            return None
+
+    graph = _dependency_graph(operations, dependencies)
+    windows = time_windows(operations, graph)
+
+    # Спершу шукаємо розв'язок у вужчому горизонті; якщо там його немає —
+    # повторюємо з гарантовано достатнім (сума тривалостей) у решту часу
+    loose_horizon = sum(int(op['duration']) for op in operations)
+    horizon = _tight_horizon(operations, windows, workers)
+    if horizon is None or horizon >= loose_horizon:
+        horizon = loose_horizon
+
+    # Жадібний розклад — допустимий розв'язок: його makespan завжди є
+    # здійсненним горизонтом, а сам він стає підказкою для CP-SAT
+    greedy = greedy_schedule(operations, graph, capable_by_op, len(workers))
+    if greedy is not None and greedy[2] < horizon:
+        horizon = greedy[2]
+    hint = greedy if greedy is not None and greedy[2] <= horizon else None
+
+    if hints:
+        warm = _hint_from_solution(operations, workers, hints)
+        if (warm is not None and warm[2] <= horizon
+                and (hint is None or warm[2] < hint[2])):
+            hint = warm
+
+    result, wall_time = _solve(operations, graph, windows, workers,
+                               capable_by_op, horizon, SOLVER_TIME_LIMIT, hint)
+    remaining = SOLVER_TIME_LIMIT - wall_time
+    if result is None and horizon < loose_horizon and remaining > 1.0:
+        result, _ = _solve(operations, graph, windows, workers,
+                           capable_by_op, loose_horizon, remaining, greedy)
+    return result
+
+
+def _break_symmetry(model, operations, graph, starts, hint):
+    """
+    Впорядкувати старти взаємозамінних операцій.
+
+    Операції з однаковими назвою, тривалістю, кількістю працівників та
+    набором попередників і наступників можна переставити місцями у будь-якому
+    розв'язку, тож достатньо шукати серед тих, де їхні старти неспадні.
+    Порядок у групі узгоджується з підказкою, щоб вона лишалась допустимою.
+    """
+    preds, succs, _ = graph
+    groups = {}
+    for op in operations:
+        oid = op['id']
+        key = (op['name'], int(op['duration']), int(op['workers_needed']),
+               frozenset(preds[oid]), frozenset(succs[oid]))
+        groups.setdefault(key, []).append(oid)
+
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        if hint is not None:
+            group.sort(key=hint[0].__getitem__)
+        for a, b in zip(group, group[1:]):
+            model.add(starts[a] <= starts[b])
 
-    horizon = sum(int(op['duration']) for op in operations)
+
+def _solve(operations, graph, windows, workers, capable_by_op, horizon, time_limit,
+           hint=None):
+    """
+    Побудувати та розв'язати модель CP-SAT. Повертає (result, wall_time).
+
+    hint — результат greedy_schedule(), яким засівається пошук.
+    """
+    model = cp_model.CpModel()
 
     starts = {}
     ends = {}
     intervals = {}
 
+    # Імена змінних порожні: вони потрібні лише для налагодження моделі,
+    # а їх форматування помітно сповільнює побудову великих моделей
     for op in operations:
         oid = op['id']
         dur = int(op['duration'])
-        s = model.new_int_var(0, horizon, 'start_%s' % oid)
-        e = model.new_int_var(0, horizon, 'end_%s' % oid)
-        iv = model.new_interval_var(s, dur, e, 'interval_%s' % oid)
+        # Старт не раніше за ланцюжок попередників, кінець — з запасом на
+        # ланцюжок наступників; порожнє вікно означає, що горизонт замалий
+        if windows is not None:
+            lo = windows[0][oid]
+            hi = horizon - windows[1][oid]
+        else:
+            lo, hi = 0, horizon
+        if hi - dur < lo:
+            return None, 0.0
+        s = model.new_int_var(lo, hi - dur, '')
+        e = model.new_int_var(lo + dur, hi, '')
+        # Інтервал зв'язує end = start + dur
+        intervals[oid] = model.new_interval_var(s, dur, e, '')
         starts[oid] = s
         ends[oid] = e
-        intervals[oid] = iv
 
-    for pred_id, succ_id in dependencies:
-        if pred_id in ends and succ_id in starts:
+    for succ_id, pred_ids in graph[0].items():
+        for pred_id in pred_ids:
             model.add(starts[succ_id] >= ends[pred_id])
 
-    assign_vars = {}
-    worker_intervals = {}
-    for w_idx in range(len(workers)):
-        worker_intervals[w_idx] = []
+    _break_symmetry(model, operations, graph, starts, hint)
+
+    # {oid: [(w_idx, bool_var), ...]}; bool_var дорівнює None, якщо
+    # призначення вимушене
+    assign_vars_by_op = {}
+    worker_intervals = [[] for _ in workers]
 
     for op in operations:
         oid = op['id']
-        op_name = op['name']
         needed = int(op['workers_needed'])
+        capable_workers = capable_by_op.get(op['name'], [])
 
-        capable_workers = []
-        for w_idx, w in enumerate(workers):
-            if op_name in w.get('operations', []):
-                capable_workers.append(w_idx)
-
-        if len(capable_workers) < needed:
-            return None
+        # Кваліфікованих рівно стільки, скільки потрібно — вибору немає:
+        # інтервал операції одразу йде до no_overlap цих працівників
+        if len(capable_workers) == needed:
+            assign_vars_by_op[oid] = [(w_idx, None) for w_idx in capable_workers]
+            for w_idx in capable_workers:
+                worker_intervals[w_idx].append(intervals[oid])
+            continue
 
         op_assign_vars = []
+        op_assign = assign_vars_by_op[oid] = []
         for w_idx in capable_workers:
-            var = model.new_bool_var('assign_w%d_op%s' % (w_idx, oid))
-            assign_vars[(w_idx, oid)] = var
+            var = model.new_bool_var('')
+            op_assign.append((w_idx, var))
             op_assign_vars.append(var)
 
             opt_interval = model.new_optional_interval_var(
                 starts[oid], int(op['duration']), ends[oid],
-                var, 'worker_interval_w%d_op%s' % (w_idx, oid)
+                var, ''
             )
             worker_intervals[w_idx].append(opt_interval)
 
-        model.add(sum(op_assign_vars) == needed)
+        if needed == 1:
+            model.add_exactly_one(op_assign_vars)
+        else:
+            model.add(cp_model.LinearExpr.sum(op_assign_vars) == needed)
 
-    for w_idx in range(len(workers)):
-        if worker_intervals[w_idx]:
-            model.add_no_overlap(worker_intervals[w_idx])
+    for ivs in worker_intervals:
+        if ivs:
+            model.add_no_overlap(ivs)
 
-    makespan = model.new_int_var(0, horizon, 'makespan')
-    for op in operations:
-        model.add(makespan >= ends[op['id']])
+    if hint is not None:
+        hint_starts, hint_assigned, _ = hint
+        for oid, s in starts.items():
+            model.add_hint(s, hint_starts[oid])
+        for oid, op_assign in assign_vars_by_op.items():
+            for w_idx, var in op_assign:
+                if var is not None:
+                    model.add_hint(var, int(w_idx in hint_assigned[oid]))
+
+    # Makespan не коротший за критичний шлях
+    makespan = model.new_int_var(_critical_path(operations, windows), horizon,
+                                 'makespan')
+    model.add_max_equality(makespan, [ends[op['id']] for op in operations])
     model.minimize(makespan)
 
     solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 30.0
+    solver.parameters.max_time_in_seconds = time_limit
+    # Паралельний портфельний пошук (не менше 4 воркерів) з фіксованим
+    # seed, щоб однакові вхідні дані давали відтворюваний розклад
+    solver.parameters.num_workers = max(4, os.cpu_count() or 4)
+    solver.parameters.random_seed = 1
+    solver.parameters.relative_gap_limit = 0.0
+    solver.parameters.log_search_progress = False
+    solver.parameters.cp_model_presolve = True
+    # Підказка з попереднього розв'язку може бути недопустимою (напр., після
+    # видалення працівника) — solver намагається її полагодити
+    solver.parameters.repair_hint = hint is not None
     status = solver.solve(model)
 
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        return None
+        return None, solver.wall_time
 
+    sv = solver.value
+    worker_names = [w['name'] for w in workers]
     assignments = []
     for op in operations:
         oid = op['id']
-        assigned_workers = []
-        for w_idx, w in enumerate(workers):
-            key = (w_idx, oid)
-            if key in assign_vars and solver.value(assign_vars[key]):
-                assigned_workers.append(w['name'])
+        assigned_workers = [worker_names[w_idx]
+                            for w_idx, var in assign_vars_by_op[oid]
+                            if var is None or sv(var)]
 
         dur_min = int(op['duration'])
         assignments.append({
             'operation_id': oid,
             'operation_name': op['name'],
-            'start': solver.value(starts[oid]),
-            'end': solver.value(ends[oid]),
+            'start': sv(starts[oid]),
+            'end': sv(ends[oid]),
             'duration': dur_min,
             'duration_hours': round(dur_min / 60, 2),
             'duration_days': round(dur_min / 480, 2),
             'workers': assigned_workers,
         })
 
-    assignments.sort(key=lambda x: (x['start'], x['operation_name']))
+    assignments.sort(key=itemgetter('start', 'operation_name'))
 
-    ms = solver.value(makespan)
+    ms = sv(makespan)
     return {
         'makespan': ms,
         'makespan_hours': round(ms / 60, 2),
         'makespan_days': round(ms / 480, 2),
         'assignments': assignments,
-    }
+    }, solver.wall_time
+
+
+def _run(operations, dependencies, workers, hints=None):
+    """Виконати задачу та загорнути результат у відповідь {'ok': ..., ...}."""
+    try:
+        result = build_schedule(operations, [tuple(d) for d in dependencies], workers,
+                                hints)
+        return {'ok': True, 'result': result}
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
+
+
+def serve_loop(conn):
+    """
+    Цикл постійного процесу solver-а (див. scheduler.SolverPool).
+    Приймає (operations, dependencies, workers, hints) з Pipe, відповідає словником.
+    """
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        conn.send(_run(*request))
 
 
 if __name__ == '__main__':
     try:
-        input_data = json.loads(sys.stdin.read())
-        result = build_schedule(
+        input_data = fast_json.loads(sys.stdin.buffer.read())
+        response = _run(
             input_data['operations'],
-            [tuple(d) for d in input_data['dependencies']],
+            input_data['dependencies'],
             input_data['workers'],
+            input_data.get('hints'),
         )
-        print(json.dumps({'ok': True, 'result': result}, ensure_ascii=False))
     except Exception as e:
-        print(json.dumps({'ok': False, 'error': str(e)}, ensure_ascii=False))
+        response = {'ok': False, 'error': str(e)}
+    sys.stdout.buffer.write(fast_json.dumps(response))
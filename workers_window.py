@@ -1,13 +1,20 @@
-import json
+from functools import cmp_to_key
+
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog,
+    QTableView, QHeaderView, QFileDialog,
     QMessageBox, QLabel, QWidget,
-    QLineEdit, QListWidget, QListWidgetItem,
-    QColorDialog, QCompleter,
+    QLineEdit, QListView, QAbstractItemView,
+    QColorDialog, QCompleter, QStyledItemDelegate, QStyle, QStyleOptionViewItem,
+    QApplication, QProgressDialog,
+)
+from PyQt5.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QStringListModel, QTimer, QEvent,
+    QRect, QSize, QCollator, QElapsedTimer, QObject, QThread, pyqtSignal, pyqtSlot,
 )
-from PyQt5.QtCore import Qt, QStringListModel
-from PyQt5.QtGui import QColor
+from PyQt5.QtGui import QColor, QPen, QPainter, QPalette
+
+import fast_json
 
 
 # Default palette for new workers (cycles through)
@@ -18,16 +25,164 @@ _DEFAULT_COLORS = [
 ]
 
 
+# Кеш пензля та пера для плашки кольору: '#rrggbb' -> (QColor, QPen)
+_SWATCH_CACHE = {}
+
+
+def _swatch_style(name):
+    style = _SWATCH_CACHE.get(name)
+    if style is None:
+        color = QColor(name)
+        style = _SWATCH_CACHE[name] = (color, QPen(color.darker(130), 2))
+    return style
+
+
+def _operation_index(operations):
+    """
+    Індекс для O(1)-пошуку операції: точна назва та назва без урахування
+    регістру (casefold) -> канонічна назва. Точний збіг має пріоритет.
+    """
+    index = {op: op for op in operations}
+    for op in operations:
+        index.setdefault(op.casefold(), op)
+    return index
+
+
+def make_operation_completer(parent=None):
+    """
+    QCompleter для пошуку операцій (без урахування регістру, за входженням)
+    з власною QStringListModel. Один екземпляр можна передавати в кілька
+    OperationListWidget, які не редагуються одночасно.
+    """
+    completer = QCompleter(parent)
+    completer.setModel(QStringListModel(completer))
+    completer.setCaseSensitivity(Qt.CaseInsensitive)
+    completer.setFilterMode(Qt.MatchContains)
+    # Модель лишається UnsortedModel: операції впорядковано за правилами
+    # локалі (QCollator), а не за кодами символів, яких очікує двійковий
+    # пошук QCompleter; для MatchContains він однаково не застосовується
+    completer.setCompletionMode(QCompleter.PopupCompletion)
+    completer.popup().setStyleSheet(
+        'QListView { font-size: 12px; }'
+        'QListView::item { padding: 3px 6px; }'
+        'QListView::item:hover { background: #e8f5e9; }'
+    )
+    return completer
+
+
+class SelectedOperationsModel(QStringListModel):
+    """
+    Plain string list of selected operations, displayed in red.
+    The '×' remove hotspot is painted by SelectedOperationDelegate.
+    """
+
+    _FOREGROUND = QColor(198, 40, 40)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.ForegroundRole:
+            return self._FOREGROUND
+        return super().data(index, role)
+
+
+class SelectedOperationDelegate(QStyledItemDelegate):
+    """
+    Paints a '×' at the right edge of each selected operation and emits
+    remove_requested(row) when it is clicked — no per-row button widgets.
+    """
+
+    HOTSPOT_WIDTH = 18
+
+    remove_requested = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Row pressed inside the hotspot; a removal needs a release on the same row
+        self._pressed_row = None
+        # Time and viewport position of the last removal, to recognise the
+        # tail of a double-click on the hotspot
+        self._since_removal = QElapsedTimer()
+        self._removal_pos = None
+
+    def _hotspot(self, rect):
+        return QRect(rect.right() - self.HOTSPOT_WIDTH + 1, rect.top(),
+                     self.HOTSPOT_WIDTH, rect.height())
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        # Leave room for the hotspot so long names do not run under it
+        opt.text = opt.fontMetrics.elidedText(
+            opt.text, Qt.ElideRight, opt.rect.width() - self.HOTSPOT_WIDTH - 8)
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        painter.save()
+        painter.setPen(SelectedOperationsModel._FOREGROUND)
+        painter.drawText(self._hotspot(option.rect), Qt.AlignCenter, '\u00d7')
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        # Rows take the viewport width and elide, instead of growing wider
+        # than the list and pushing the hotspot out of view
+        size = super().sizeHint(option, index)
+        return QSize(self.HOTSPOT_WIDTH * 2, size.height())
+
+    def editorEvent(self, event, model, option, index):
+        kind = event.type()
+        if (kind in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease)
+                and event.button() == Qt.LeftButton):
+            in_hotspot = self._hotspot(option.rect).contains(event.pos())
+            if kind == QEvent.MouseButtonPress:
+                self._pressed_row = index.row() if in_hotspot else None
+            else:
+                pressed_row, self._pressed_row = self._pressed_row, None
+                if in_hotspot:
+                    # A double-click on the hotspot arrives as a second
+                    # press/release once the first row is gone (the view
+                    # turns it into a press on the row that moved up):
+                    # ignore it instead of removing that row too
+                    if (pressed_row == index.row()
+                            and not self._is_double_click_tail(event)):
+                        self._since_removal.start()
+                        self._removal_pos = event.pos()
+                        self.remove_requested.emit(index.row())
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+    def _is_double_click_tail(self, event):
+        """True if the release is close to the last removal in both time and space."""
+        if not self._since_removal.isValid():
+            return False
+        if self._since_removal.elapsed() >= QApplication.doubleClickInterval():
+            return False
+        distance = QApplication.styleHints().mouseDoubleClickDistance()
+        return (event.pos() - self._removal_pos).manhattanLength() <= distance
+
+
 class OperationListWidget(QWidget):
     """
     Widget with a QCompleter-based search field for adding operations
-    and a list of selected operations. Double-click selected to remove.
+    and a list of selected operations. Click the '×' of a selected
+    operation or double-click it to remove it.
+    Emits operations_changed whenever the user adds or removes an operation.
     """
 
-    def __init__(self, available_operations, selected_operations=None, parent=None):
+    operations_changed = pyqtSignal()
+
+    # Delay before the completer re-filters after the last keystroke, ms
+    FILTER_DELAY_MS = 80
+
+    def __init__(self, available_operations, selected_operations=None, parent=None,
+                 available_index=None, completer=None):
         super().__init__(parent)
-        self._available = list(available_operations)
+        # available_operations / available_index may be shared by all rows
+        # of the table, so they are stored as-is and never mutated
+        self._available = tuple(available_operations)
+        self._available_index = (available_index if available_index is not None
+                                 else _operation_index(self._available))
         self._selected = list(selected_operations or [])
+        # Mirrors self._selected for O(1) membership checks
+        self._selected_set = set(self._selected)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(4, 2, 4, 2)
@@ -39,111 +194,410 @@ class OperationListWidget(QWidget):
         self._search.setStyleSheet('padding: 4px;')
         self._search.returnPressed.connect(self._on_return_pressed)
 
-        self._completer_model = QStringListModel()
-        self._completer = QCompleter()
-        self._completer.setModel(self._completer_model)
-        self._completer.setCaseSensitivity(Qt.CaseInsensitive)
-        self._completer.setFilterMode(Qt.MatchContains)
-        self._completer.setCompletionMode(QCompleter.PopupCompletion)
-        self._completer.popup().setStyleSheet(
-            'QListView { font-size: 12px; }'
-            'QListView::item { padding: 3px 6px; }'
-            'QListView::item:hover { background: #e8f5e9; }'
-        )
-        self._search.setCompleter(self._completer)
+        # A shared completer (see make_operation_completer) is reused
+        # instead of building a new QCompleter and popup per widget
+        self._completer = completer or make_operation_completer(self)
+        self._completer_model = self._completer.model()
+        # The completer is attached with setWidget() rather than
+        # setCompleter(), so it does not re-filter on every keystroke;
+        # _apply_filter() runs once a burst of typing settles
+        self._completer.setWidget(self._search)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self._search.textEdited.connect(self._on_text_edited)
 
         self._completer.activated.connect(self._on_completer_activated)
         layout.addWidget(self._search)
+        self.setFocusProxy(self._search)
 
         # --- Selected operations list ---
-        lbl_sel = QLabel('Обрані операції (подвійний клік — видалити):')
+        lbl_sel = QLabel('Обрані операції (× або подвійний клік — видалити):')
         lbl_sel.setStyleSheet('font-size: 10px; color: #666; margin-top: 2px;')
         layout.addWidget(lbl_sel)
 
-        self._selected_list = QListWidget()
+        self._selected_model = SelectedOperationsModel(self)
+        self._selected_list = QListView()
+        self._selected_list.setModel(self._selected_model)
+        self._selected_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self._selected_list.setStyleSheet(
-            'QListWidget { font-size: 11px; }'
-            'QListWidget::item { padding: 2px 4px; }'
-            'QListWidget::item:hover { background: #ffebee; }'
+            'QListView { font-size: 11px; }'
+            'QListView::item { padding: 2px 4px; }'
+            'QListView::item:hover { background: #ffebee; }'
         )
-        self._selected_list.itemDoubleClicked.connect(self._on_selected_clicked)
+        self._selected_delegate = SelectedOperationDelegate(self._selected_list)
+        self._selected_delegate.remove_requested.connect(self._remove_row)
+        self._selected_list.setItemDelegate(self._selected_delegate)
+        self._selected_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self._selected_list.doubleClicked.connect(self._on_selected_clicked)
         layout.addWidget(self._selected_list, 1)
 
         self._rebuild()
 
     def _on_return_pressed(self):
         """Handle Enter key — add current completion or just consume the event."""
-        text = self._search.text().strip()
-        if text in self._available and text not in self._selected:
-            self._selected.append(text)
-            self._rebuild()
+        self._filter_timer.stop()
+        self._add_selected(self._search.text().strip())
         self._search.clear()
 
+    def _on_text_edited(self, _text):
+        self._filter_timer.start()
+
+    def _apply_filter(self):
+        """Filter the completer by the current search text and show the popup."""
+        text = self._search.text().strip()
+        if not text:
+            self._completer.popup().hide()
+            return
+        if self._completer.widget() is not self._search:
+            # Shared completer was last used by another widget
+            self._completer.setWidget(self._search)
+            self._completer_dirty = True
+        if self._completer_dirty:
+            self._update_completer()
+        self._completer.setCompletionPrefix(text)
+        self._completer.complete()
+
     def _update_completer(self):
         """Update completer model with operations not yet selected."""
-        not_selected = [op for op in self._available if op not in self._selected]
+        selected = self._selected_set
+        not_selected = [op for op in self._available if op not in selected]
         self._completer_model.setStringList(not_selected)
+        self._completer_dirty = False
 
     def _on_completer_activated(self, text):
         """User selected an operation from the autocomplete popup."""
-        op = text.strip()
-        if op in self._available and op not in self._selected:
-            self._selected.append(op)
-            self._rebuild()
+        if self._completer.widget() is not self._search:
+            return  # shared completer currently serves another widget
+        self._filter_timer.stop()
+        self._add_selected(text.strip())
         self._search.clear()
 
-    def _on_selected_clicked(self, item):
-        op = item.text().lstrip('\u00d7 ')
-        if op in self._selected:
-            self._selected.remove(op)
-            self._rebuild()
+    def _add_selected(self, text):
+        index = self._available_index
+        op = index.get(text) or index.get(text.casefold())
+        if op is not None and op not in self._selected_set:
+            self._selected.append(op)
+            self._selected_set.add(op)
+            self._append_item(op)
+            self.operations_changed.emit()
+
+    def _on_selected_clicked(self, index):
+        self._remove_row(index.row())
+
+    def _remove_row(self, row):
+        # Row of the view is the position in self._selected: no value search
+        if 0 <= row < len(self._selected):
+            op = self._selected.pop(row)
+            self._selected_set.discard(op)
+            self._selected_model.removeRows(row, 1)
+            self._completer_dirty = True
+            self.operations_changed.emit()
+
+    def _append_item(self, op):
+        """Append one row to the selected list; the completer refreshes lazily."""
+        row = self._selected_model.rowCount()
+        self._selected_model.insertRows(row, 1)
+        self._selected_model.setData(self._selected_model.index(row), op)
+        self._completer_dirty = True
 
     def _rebuild(self):
-        """Rebuild selected list and update completer."""
-        self._selected_list.clear()
-        for op in self._selected:
-            item = QListWidgetItem(f'\u00d7 {op}')
-            item.setForeground(QColor(198, 40, 40))
-            self._selected_list.addItem(item)
-
-        self._update_completer()
+        """Rebuild the whole selected list; the completer refreshes lazily."""
+        self._selected_model.setStringList(self._selected)
+        self._completer_dirty = True
 
     def get_selected_operations(self):
         return list(self._selected)
 
+    def update_selected(self, selected_operations):
+        """Replace the selection in place (no widget re-creation)."""
+        self._selected = list(selected_operations)
+        self._selected_set = set(self._selected)
+        self._rebuild()
+
+    def set_available_operations(self, available_operations, available_index=None):
+        """Replace the pool of operations offered by the completer."""
+        self._available = tuple(available_operations)
+        self._available_index = (available_index if available_index is not None
+                                 else _operation_index(self._available))
+        self._completer_dirty = True
+
+
+# Роль, що повертає всі ролі відображення клітинки одним словником
+# {role: value} — делегат отримує їх за один виклик data()
+MULTIPLE_ROLES = Qt.UserRole + 42
+
+
+class WorkersModel(QAbstractTableModel):
+    """
+    Table model over the workers list: name, colour and operations columns.
+    The model owns the list and is the single source of truth for the dialog.
+    """
 
-class ColorButton(QPushButton):
-    """A button that shows its color and opens a color picker on click."""
+    COL_NAME, COL_COLOR, COL_OPERATIONS = range(3)
+    HEADERS = ("Ім'я працівника", 'Колір', 'Доступні операції')
 
-    def __init__(self, color='#4CAF50', parent=None):
+    _OPERATIONS_FOREGROUND = QColor(198, 40, 40)
+    _PLACEHOLDER_FOREGROUND = QColor('#999')
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self._color = QColor(color)
-        self.setFixedSize(36, 36)
-        self.setCursor(Qt.PointingHandCursor)
-        self.setToolTip('Обрати колір')
-        self.clicked.connect(self._pick_color)
-        self._update_style()
-
-    def _pick_color(self):
-        color = QColorDialog.getColor(self._color, self, 'Обрати колір працівника')
-        if color.isValid():
-            self._color = color
-            self._update_style()
-
-    def _update_style(self):
-        self.setStyleSheet(
-            f'QPushButton {{ background-color: {self._color.name()}; '
-            f'border: 2px solid {self._color.darker(130).name()}; '
-            f'border-radius: 4px; }}'
-            f'QPushButton:hover {{ border: 2px solid #333; }}'
-        )
+        self._workers = []  # [{'name': str, 'operations': [str, ...], 'color': str}]
+        # {row: {role: value}} for the operations column; rows shift on
+        # insert/remove, so those clear it, while setData() drops one row
+        self._roles_cache = {}
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._workers)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() != self.COL_COLOR:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        worker = self._workers[index.row()]
+        column = index.column()
+
+        if column == self.COL_NAME:
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return worker['name']
+
+        elif column == self.COL_COLOR:
+            if role == Qt.BackgroundRole:
+                return _swatch_style(worker['color'])[0]
+            if role == Qt.EditRole:
+                return worker['color']
+            if role == Qt.ToolTipRole:
+                return 'Обрати колір'
+
+        elif column == self.COL_OPERATIONS:
+            if role == Qt.EditRole:
+                return list(worker['operations'])
+            roles = self._operations_roles(index.row())
+            if role == MULTIPLE_ROLES:
+                return roles
+            return roles.get(role)
+
+        return None
+
+    def _operations_roles(self, row):
+        roles = self._roles_cache.get(row)
+        if roles is None:
+            ops = self._workers[row]['operations']
+            if ops:
+                text = '\n'.join(f'\u00d7 {op}' for op in ops)
+                foreground = self._OPERATIONS_FOREGROUND
+            else:
+                text = 'Подвійний клік — обрати операції'
+                foreground = self._PLACEHOLDER_FOREGROUND
+            roles = self._roles_cache[row] = {
+                Qt.DisplayRole: text,
+                Qt.ForegroundRole: foreground,
+                Qt.TextAlignmentRole: Qt.AlignLeft | Qt.AlignTop,
+                Qt.SizeHintRole: QSize(0, self.row_height(row)),
+            }
+        return roles
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        worker = self._workers[index.row()]
+        column = index.column()
+        if column == self.COL_NAME:
+            worker['name'] = str(value)
+        elif column == self.COL_COLOR:
+            worker['color'] = QColor(value).name()
+        elif column == self.COL_OPERATIONS:
+            if list(value) == worker['operations']:
+                return True
+            worker['operations'] = list(value)
+            self._roles_cache.pop(index.row(), None)
+        else:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    # --- Workers list ---
+
+    def row_height(self, row):
+        return max(120, 22 * len(self._workers[row]['operations']) + 70)
+
+    def workers(self):
+        return self._workers
+
+    def set_workers(self, workers):
+        # Нормалізуємо до beginResetModel(): виняток на некоректному записі
+        # не повинен лишити модель посеред скидання
+        workers = [self._normalized(row, w) for row, w in enumerate(workers)]
+        self.beginResetModel()
+        self._workers = workers
+        self._roles_cache.clear()
+        self.endResetModel()
+
+    def append_worker(self, worker):
+        row = len(self._workers)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._workers.append(self._normalized(row, worker))
+        self.endInsertRows()  # appended at the end: cached rows keep their numbers
+
+    def remove_rows(self, rows):
+        """Remove rows, one beginRemoveRows() per contiguous run (bottom-up)."""
+        # Ascending order, consumed from the end with pop(): O(1) per row
+        rows = sorted({r for r in rows if 0 <= r < len(self._workers)})
+        while rows:
+            last = first = rows.pop()
+            while rows and rows[-1] == first - 1:
+                first = rows.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._workers[first:last + 1]
+            self._roles_cache.clear()
+            self.endRemoveRows()
+
+    @staticmethod
+    def _normalized(row, worker):
+        color = worker.get('color') or _DEFAULT_COLORS[row % len(_DEFAULT_COLORS)]
+        return {
+            'name': worker.get('name', ''),
+            'operations': list(worker.get('operations') or ()),
+            'color': QColor(color).name(),
+        }
+
+
+class ColorSwatchDelegate(QStyledItemDelegate):
+    """Paints the worker colour as a swatch and opens a color picker on click."""
+
+    SWATCH_SIZE = 36
+
+    def paint(self, painter, option, index):
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        color, pen = _swatch_style(index.data(Qt.EditRole))
+        size = min(self.SWATCH_SIZE, option.rect.width() - 4, option.rect.height() - 4)
+        swatch = QRect(0, 0, size, size)
+        swatch.moveCenter(option.rect.center())
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(pen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(swatch, 4, 4)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(self.SWATCH_SIZE + 8, self.SWATCH_SIZE + 8)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease
+                and event.button() == Qt.LeftButton
+                and option.rect.contains(event.pos())):
+            color = QColorDialog.getColor(index.data(Qt.BackgroundRole),
+                                          option.widget, 'Обрати колір працівника')
+            if color.isValid():
+                model.setData(index, color.name())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class OperationsDelegate(QStyledItemDelegate):
+    """
+    Shows the selected operations as text and edits them with an
+    OperationListWidget opened only while the cell is being edited.
+    """
+
+    def __init__(self, completer, parent=None):
+        super().__init__(parent)
+        self._completer = completer
+        self._available = ()
+        self._available_index = {}
+
+    def set_available_operations(self, available_operations, available_index):
+        self._available = available_operations
+        self._available_index = available_index
+
+    def createEditor(self, parent, option, index):
+        editor = OperationListWidget(self._available, index.data(Qt.EditRole), parent,
+                                     available_index=self._available_index,
+                                     completer=self._completer)
+        editor.setAutoFillBackground(True)
+        # Кожна зміна одразу потрапляє в модель, тож закриття редактора
+        # нічого не втрачає
+        editor.operations_changed.connect(self._commit_editor)
+        return editor
+
+    def _commit_editor(self):
+        self.commitData.emit(self.sender())
+
+    def initStyleOption(self, option, index):
+        # One data() call instead of one per role (see MULTIPLE_ROLES)
+        roles = index.data(MULTIPLE_ROLES)
+        if roles is None:
+            super().initStyleOption(option, index)
+            return
+        option.index = index
+        option.features |= QStyleOptionViewItem.HasDisplay
+        option.text = roles[Qt.DisplayRole]
+        option.displayAlignment = roles[Qt.TextAlignmentRole]
+        palette = QPalette(option.palette)
+        palette.setColor(QPalette.Text, roles[Qt.ForegroundRole])
+        option.palette = palette
 
-    def get_color(self):
-        return self._color.name()
+    def setEditorData(self, editor, index):
+        ops = index.data(Qt.EditRole)
+        if ops != editor.get_selected_operations():
+            editor.update_selected(ops)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.get_selected_operations())
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
+
+class JsonIOWorker(QObject):
+    """
+    Читання та запис JSON-файлу працівників у фоновому потоці
+    (див. WorkersWindow._io_worker). Результат повертається сигналами.
+    """
+
+    saved = pyqtSignal(str)
+    loaded = pyqtSignal(str, object)
+    failed = pyqtSignal(str)
+
+    @pyqtSlot(str, object)
+    def save(self, path, workers):
+        try:
+            with open(path, 'wb') as f:
+                f.write(fast_json.dumps(workers, indent=True))
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.saved.emit(path)
 
-    def set_color(self, color_str):
-        self._color = QColor(color_str)
-        self._update_style()
+    @pyqtSlot(str)
+    def load(self, path):
+        try:
+            with open(path, 'rb') as f:
+                data = fast_json.loads(f.read())
+            if not isinstance(data, list) or not all(isinstance(w, dict) for w in data):
+                raise ValueError('Невірний формат файлу')
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.loaded.emit(path, data)
 
 
 class WorkersWindow(QDialog):
@@ -152,13 +606,28 @@ class WorkersWindow(QDialog):
     Дозволяє додавати/видаляти працівників та призначати їм операції.
     """
 
+    # Запити до JsonIOWorker (виконуються в його потоці)
+    _save_requested = pyqtSignal(str, object)
+    _load_requested = pyqtSignal(str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle('Управління працівниками')
         self.setMinimumSize(750, 500)
 
-        self._workers = []  # [{'name': str, 'operations': [str, ...], 'color': str}]
-        self._available_operations = []
+        self._model = WorkersModel(self)
+        # Спільні для всіх рядків: відсортований кортеж операцій та індекс
+        self._available_operations = ()
+        self._available_index = {}
+        self._available_source = None  # останній вхід set_available_operations
+
+        self._collator = QCollator()
+        self._collator.setCaseSensitivity(Qt.CaseInsensitive)
+
+        # Потік файлового вводу/виводу створюється при першому зверненні
+        self._io_thread = None
+        self._io_worker = None
+        self._io_progress = None
 
         self._init_ui()
 
@@ -170,15 +639,32 @@ class WorkersWindow(QDialog):
         lbl.setStyleSheet('font-weight: bold; font-size: 14px;')
         layout.addWidget(lbl)
 
-        self._table = QTableWidget(0, 3)
-        self._table.setHorizontalHeaderLabels(["Ім'я працівника", 'Колір', 'Доступні операції'])
+        self._table = QTableView()
+        self._table.setModel(self._model)
+        self._table.verticalHeader().hide()
         self._table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self._table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Fixed)
         self._table.horizontalHeader().resizeSection(1, 50)
         self._table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
-        self._table.setSelectionBehavior(QTableWidget.SelectRows)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._table.setEditTriggers(QAbstractItemView.DoubleClicked
+                                    | QAbstractItemView.EditKeyPressed)
+        self._table.setWordWrap(False)
+
+        # Один QCompleter на всі редактори операцій
+        self._ops_completer = make_operation_completer(self)
+        self._ops_delegate = OperationsDelegate(self._ops_completer, self._table)
+        self._table.setItemDelegateForColumn(WorkersModel.COL_COLOR,
+                                             ColorSwatchDelegate(self._table))
+        self._table.setItemDelegateForColumn(WorkersModel.COL_OPERATIONS,
+                                             self._ops_delegate)
         layout.addWidget(self._table)
 
+        # Висота рядка залежить від кількості обраних операцій
+        self._model.modelReset.connect(self._update_row_heights)
+        self._model.rowsInserted.connect(self._on_rows_inserted)
+        self._model.dataChanged.connect(self._on_data_changed)
+
         # --- Кнопки додавання / видалення ---
         btn_row = QHBoxLayout()
 
@@ -211,128 +697,139 @@ class WorkersWindow(QDialog):
 
     def set_available_operations(self, operations: list[str]):
         """Оновити список доступних операцій (з графа)."""
-        self._available_operations = sorted(set(operations))
-        self._refresh_table()
+        operations = tuple(dict.fromkeys(operations))
+        if operations == self._available_source:
+            return  # той самий граф — сортування та індекс уже готові
+        self._available_source = operations
+        # Алфавітний порядок за локаллю (для кирилиці sorted() дає
+        # порядок кодів символів: «є», «і», «ї», «ґ» опиняються не на місці)
+        ops = sorted(operations, key=cmp_to_key(self._collator.compare))
+        self._available_operations = tuple(ops)
+        self._available_index = _operation_index(self._available_operations)
+        self._ops_delegate.set_available_operations(self._available_operations,
+                                                    self._available_index)
 
     def get_workers_data(self) -> list[dict]:
         """Повернути дані працівників у форматі списку словників."""
-        self._sync_from_table()
-        return self._workers
+        return self._model.workers()
 
     def set_workers_data(self, workers: list[dict]):
-        self._workers = workers
-        self._refresh_table()
+        self._model.set_workers(workers)
 
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
     def _add_worker(self):
-        self._sync_from_table()
-        idx = len(self._workers)
-        color = _DEFAULT_COLORS[idx % len(_DEFAULT_COLORS)]
-        self._workers.append({
+        idx = self._model.rowCount()
+        self._model.append_worker({
             'name': f'Працівник {idx + 1}',
             'operations': [],
-            'color': color,
+            'color': _DEFAULT_COLORS[idx % len(_DEFAULT_COLORS)],
         })
-        self._refresh_table()
 
     def _remove_worker(self):
-        rows = sorted(set(idx.row() for idx in self._table.selectedIndexes()),
-                      reverse=True)
-        if not rows:
-            return
-        self._sync_from_table()
-        for r in rows:
-            if r < len(self._workers):
-                self._workers.pop(r)
-        self._refresh_table()
-
-    def _sync_from_table(self):
-        """Зчитати стан таблиці назад у self._workers."""
-        workers = []
-        for row in range(self._table.rowCount()):
-            name_item = self._table.item(row, 0)
-            name = name_item.text() if name_item else f'Працівник {row + 1}'
-
-            # Color
-            color_widget = self._table.cellWidget(row, 1)
-            color = '#4CAF50'
-            if color_widget:
-                btn = color_widget.findChild(ColorButton)
-                if btn:
-                    color = btn.get_color()
-
-            # Operations
-            ops_widget = self._table.cellWidget(row, 2)
-            selected_ops = []
-            if isinstance(ops_widget, OperationListWidget):
-                selected_ops = ops_widget.get_selected_operations()
-
-            workers.append({'name': name, 'operations': selected_ops, 'color': color})
-        self._workers = workers
-
-    def _refresh_table(self):
-        self._table.setRowCount(len(self._workers))
-        for row, worker in enumerate(self._workers):
-            # Ім'я
-            name_item = QTableWidgetItem(worker.get('name', ''))
-            self._table.setItem(row, 0, name_item)
-
-            # Колір
-            color_container = QWidget()
-            color_layout = QHBoxLayout(color_container)
-            color_layout.setContentsMargins(4, 4, 4, 4)
-            color_layout.setAlignment(Qt.AlignCenter)
-            color_str = worker.get('color', _DEFAULT_COLORS[row % len(_DEFAULT_COLORS)])
-            color_btn = ColorButton(color_str)
-            color_layout.addWidget(color_btn)
-            self._table.setCellWidget(row, 1, color_container)
-
-            # Операції — випадаючий список з пошуком
-            worker_ops = worker.get('operations', [])
-            ops_widget = OperationListWidget(
-                self._available_operations, worker_ops
-            )
-            self._table.setCellWidget(row, 2, ops_widget)
-
-            selected_count = len(worker_ops)
-            self._table.setRowHeight(row, max(120, 22 * selected_count + 70))
+        rows = [idx.row() for idx in self._table.selectionModel().selectedRows()]
+        if rows:
+            self._model.remove_rows(rows)
+
+    def _on_rows_inserted(self, _parent, first, last):
+        self._update_row_heights(first, last)
+
+    def _on_data_changed(self, top_left, bottom_right, _roles=()):
+        self._update_row_heights(top_left.row(), bottom_right.row())
+
+    def _update_row_heights(self, first=0, last=None):
+        if last is None:
+            last = self._model.rowCount() - 1
+        table = self._table
+        # Після скидання моделі (set_workers_data, завантаження з файлу)
+        # висоти змінюються пакетно — з одним перемальовуванням наприкінці
+        table.setUpdatesEnabled(False)
+        try:
+            for row in range(first, last + 1):
+                table.setRowHeight(row, self._model.row_height(row))
+        finally:
+            table.setUpdatesEnabled(True)
 
     # ------------------------------------------------------------------
     # File I/O
     # ------------------------------------------------------------------
 
     def save_to_file(self):
-        self._sync_from_table()
+        if self._io_progress is not None:
+            return
         path, _ = QFileDialog.getSaveFileName(
             self, 'Зберегти працівників', '', 'JSON файли (*.json)')
         if not path:
             return
         if not path.endswith('.json'):
             path += '.json'
-        try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(self._workers, f, ensure_ascii=False, indent=2)
-            QMessageBox.information(self, 'Збережено',
-                                   f'Працівників збережено у {path}')
-        except Exception as e:
-            QMessageBox.critical(self, 'Помилка', str(e))
+        # Знімок даних: модель може змінитися, поки файл пишеться
+        workers = [dict(w, operations=list(w['operations']))
+                   for w in self._model.workers()]
+        self._start_io('Збереження працівників...')
+        self._save_requested.emit(path, workers)
 
     def load_from_file(self):
+        if self._io_progress is not None:
+            return
         path, _ = QFileDialog.getOpenFileName(
             self, 'Завантажити працівників', '', 'JSON файли (*.json)')
         if not path:
             return
+        self._start_io('Завантаження працівників...')
+        self._load_requested.emit(path)
+
+    def _start_io(self, label):
+        """Запустити потік вводу/виводу (за потреби) та показати прогрес."""
+        if self._io_thread is None:
+            self._io_thread = QThread(self)
+            self._io_worker = JsonIOWorker()
+            self._io_worker.moveToThread(self._io_thread)
+            self._save_requested.connect(self._io_worker.save)
+            self._load_requested.connect(self._io_worker.load)
+            self._io_worker.saved.connect(self._on_saved)
+            self._io_worker.loaded.connect(self._on_loaded)
+            self._io_worker.failed.connect(self._on_io_failed)
+            self._io_thread.finished.connect(self._io_worker.deleteLater)
+            QApplication.instance().aboutToQuit.connect(self._stop_io_thread)
+            self._io_thread.start()
+
+        # Показується лише якщо операція триває довше за minimumDuration
+        progress = QProgressDialog(label, None, 0, 0, self)
+        progress.setCancelButton(None)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        self._io_progress = progress
+
+    def _finish_io(self):
+        if self._io_progress is not None:
+            self._io_progress.close()
+            self._io_progress.deleteLater()
+            self._io_progress = None
+
+    def _stop_io_thread(self):
+        if self._io_thread is not None:
+            self._io_thread.quit()
+            self._io_thread.wait()
+            self._io_thread = None
+
+    def _on_saved(self, path):
+        self._finish_io()
+        QMessageBox.information(self, 'Збережено',
+                               f'Працівників збережено у {path}')
+
+    def _on_loaded(self, path, data):
+        self._finish_io()
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                raise ValueError('Невірний формат файлу')
-            self._workers = data
-            self._refresh_table()
-            QMessageBox.information(self, 'Завантажено',
-                                   f'Працівників завантажено з {path}')
+            self._model.set_workers(data)
         except Exception as e:
             QMessageBox.critical(self, 'Помилка', str(e))
+            return
+        QMessageBox.information(self, 'Завантажено',
+                               f'Працівників завантажено з {path}')
+
+    def _on_io_failed(self, message):
+        self._finish_io()
+        QMessageBox.critical(self, 'Помилка', message)